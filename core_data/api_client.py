@@ -1,9 +1,11 @@
 import os
 import time
 import logging
+import threading
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +24,16 @@ MIN_REQUEST_INTERVAL = float(os.getenv("API_FOOTBALL_MIN_INTERVAL", "0.3"))
 MAX_RETRIES = int(os.getenv("API_FOOTBALL_MAX_RETRIES", "3"))
 RETRY_BACKOFF_BASE = float(os.getenv("API_FOOTBALL_BACKOFF_BASE", "0.8"))
 
-# Interno stanje za jednostavan QPS limiter
+# Interno stanje za jednostavan QPS limiter (deli se između ingest thread-ova)
 _last_request_ts: float = 0.0
+_qps_lock = threading.Lock()
+
+# Jedna keep-alive sesija za sve pozive: TLS handshake se radi jednom po
+# konekciji, ne po zahtevu. Retry ostaje u _request (bez urllib3 Retry,
+# da se pokušaji ne množe).
+POOL_SIZE = int(os.getenv("API_FOOTBALL_POOL_SIZE", "32"))
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
 
 
 # ---------------------------------------------------------------------
@@ -39,14 +49,17 @@ def _respect_qps_limit() -> None:
     """
     Vrlo jednostavan limiter:
     - obezbedi da je bar MIN_REQUEST_INTERVAL prošlo između 2 poziva.
+    - thread-safe: paralelni pozivi se i dalje startuju u razmaku od
+      MIN_REQUEST_INTERVAL, ali čekanje na odgovor se preklapa.
     """
     global _last_request_ts
-    now = time.time()
-    delta = now - _last_request_ts
-    if delta < MIN_REQUEST_INTERVAL:
-        sleep_for = MIN_REQUEST_INTERVAL - delta
-        time.sleep(sleep_for)
-    _last_request_ts = time.time()
+    with _qps_lock:
+        now = time.time()
+        delta = now - _last_request_ts
+        if delta < MIN_REQUEST_INTERVAL:
+            sleep_for = MIN_REQUEST_INTERVAL - delta
+            time.sleep(sleep_for)
+        _last_request_ts = time.time()
 
 
 def _request(
@@ -76,7 +89,7 @@ def _request(
         attempt += 1
         try:
             _respect_qps_limit()
-            resp = requests.request(method, url, headers=headers, params=params, timeout=timeout)
+            resp = _session.request(method, url, headers=headers, params=params, timeout=timeout)
 
             logger.debug(
                 "API-Football request: %s %s params=%s status=%s",
@@ -147,7 +160,7 @@ def get_api_status() -> Dict[str, Any]:
     }
     rl_info: Dict[str, Any] = {}
     try:
-        raw_resp = requests.get(status_url, headers=headers, timeout=10)
+        raw_resp = _session.get(status_url, headers=headers, timeout=10)
         rl_info = {
             "x-ratelimit-requests-limit": raw_resp.headers.get("x-ratelimit-requests-limit"),
             "x-ratelimit-requests-remaining": raw_resp.headers.get("x-ratelimit-requests-remaining"),
@@ -1,9 +1,10 @@
-import json
 import os
 from pathlib import Path
 from datetime import date
 from typing import Any, Optional, Union
 
+import orjson
+
 # Root cache folder: /cache
 CACHE_ROOT = Path(__file__).resolve().parent.parent / "cache"
 
@@ -31,18 +32,39 @@ def _full_path(rel_path: str, day: Optional[date] = None) -> Path:
     return fp
 
 
+def _same_content(fp: Path, payload: bytes) -> bool:
+    """True if fp already holds exactly payload."""
+    try:
+        if fp.stat().st_size != len(payload):
+            return False
+        return fp.read_bytes() == payload
+    except OSError:
+        return False
+
+
 # -----------------------------
 # Public API
 # -----------------------------
 
-def write_json(name: str, data: Any, day: Optional[date] = None) -> Path:
+def write_json(
+    name: str,
+    data: Any,
+    day: Optional[date] = None,
+    skip_unchanged: bool = False,
+) -> Path:
     """
     Write JSON to /cache/YYYY-MM-DD/name.
+    Cache files are written compact with orjson (UTF-8 bytes, non-str dict
+    keys stringified like the stdlib does) in a single write.
+    With skip_unchanged=True an existing file with identical bytes is left
+    untouched (size is compared first, so changed files cost one stat).
     Returns filepath.
     """
     fp = _full_path(name, day)
-    with fp.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    if skip_unchanged and _same_content(fp, payload):
+        return fp
+    fp.write_bytes(payload)
     return fp
 
 
@@ -55,9 +77,8 @@ def read_json(name: str, day: Optional[date] = None) -> Optional[Any]:
     if not fp.exists():
         return None
     try:
-        with fp.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
+        return orjson.loads(fp.read_bytes())
+    except orjson.JSONDecodeError:
         return None
 
 
@@ -67,6 +88,27 @@ def exists(name: str, day: Optional[date] = None) -> bool:
     return fp.exists()
 
 
+# Fajlovi manji od ovoga se parsiraju (null, "", [], {}, 0, odsečen fajl ...)
+_HAS_DATA_PARSE_BELOW = 16
+
+
+def has_data(name: str, day: Optional[date] = None) -> bool:
+    """
+    True if the cached file exists and holds a non-empty JSON value, without
+    mkdir. Files under 16 bytes are parsed and must be truthy (so null, [],
+    {} and corrupt stubs count as missing); larger files are judged by size
+    only and are not validated.
+    """
+    fp = CACHE_ROOT / _date_str(day) / name
+    try:
+        size = fp.stat().st_size
+        if size >= _HAS_DATA_PARSE_BELOW:
+            return True
+        return bool(orjson.loads(fp.read_bytes()))
+    except (OSError, orjson.JSONDecodeError):
+        return False
+
+
 def list_day(day: Optional[date] = None) -> list[str]:
     """
     List all files inside /cache/YYYY-MM-DD.
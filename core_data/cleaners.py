@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 import logging
+import re
+import sys
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Deljeni prazan dict za `x.get(...) or _EMPTY` lance – samo se čita, nikad ne menja.
+_EMPTY: Dict[str, Any] = {}
+
+# Završeni / otkazani statusi koje ne želimo u builderima
+_FINISHED_STATUSES = frozenset({"FT", "AET", "PEN", "CANC", "ABD", "PST", "AWD", "WO"})
+
 # ---------------------------------------------------------------------------
 # Helper: standardize access to raw["response"]
 # ---------------------------------------------------------------------------
@@ -71,21 +80,20 @@ def clean_fixtures(raw: Any) -> List[Dict[str, Any]]:
         if not isinstance(item, dict):
             continue
 
-        fixture = item.get("fixture") or {}
-        league = item.get("league") or {}
-        teams = item.get("teams") or {}
+        fixture = item.get("fixture") or _EMPTY
+        league = item.get("league") or _EMPTY
+        teams = item.get("teams") or _EMPTY
 
         fid = fixture.get("id")
         lid = league.get("id")
-        home = (teams.get("home") or {}).get("name")
-        away = (teams.get("away") or {}).get("name")
+        home = (teams.get("home") or _EMPTY).get("name")
+        away = (teams.get("away") or _EMPTY).get("name")
 
         if fid is None or lid is None or not home or not away:
             continue
 
-        status = (fixture.get("status") or {}).get("short")
-        # završeni / otkazani statusi koje ne želimo u builderima
-        if status in {"FT", "AET", "PEN", "CANC", "ABD", "PST", "AWD", "WO"}:
+        status = fixture.get("status") or _EMPTY
+        if status.get("short") in _FINISHED_STATUSES:
             continue
 
         cleaned.append(item)
@@ -98,9 +106,21 @@ def clean_fixtures(raw: Any) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
+_GOAL_LINE_RE = re.compile(r"(\d+(\.\d)?)")
+
+
 def _map_market(bet_name: Any, label: Any) -> Optional[str]:
-    bn = str(bet_name or "").lower().strip()
-    lb = str(label or "").lower().strip()
+    return _map_market_cached(str(bet_name or ""), str(label or ""))
+
+
+@lru_cache(maxsize=4096)
+def _map_market_cached(bet_name: str, label: str) -> Optional[str]:
+    """
+    (bet_name, label) parovi se ponavljaju hiljadama puta po danu
+    (isti marketi kod svih kladionica), pa se mapiranje kešira.
+    """
+    bn = bet_name.lower().strip()
+    lb = label.lower().strip()
 
     # Normalizacija
     bn = bn.replace("-", " ").replace("_", " ")
@@ -137,9 +157,7 @@ def _map_market(bet_name: Any, label: Any) -> Optional[str]:
     # --- OVER/UNDER total goals ---
     if "over" in lb or "under" in lb or "goals" in bn or "total" in bn:
         # pronalazi broj 1.5,2.5,3.5 iz labela
-        import re
-
-        m = re.search(r"(\d+(\.\d)?)", lb)
+        m = _GOAL_LINE_RE.search(lb)
         if not m:
             return None
         g = float(m.group(1))
@@ -180,13 +198,14 @@ def clean_odds(raw: Any) -> List[Dict[str, Any]]:
     """
     response = _safe_response(raw)
     cleaned: List[Dict[str, Any]] = []
+    append = cleaned.append
 
     for item in response:
         if not isinstance(item, dict):
             continue
 
-        fixture = item.get("fixture") or {}
-        league = item.get("league") or {}
+        fixture = item.get("fixture") or _EMPTY
+        league = item.get("league") or _EMPTY
 
         fid = fixture.get("id")
         lid = league.get("id")
@@ -194,32 +213,36 @@ def clean_odds(raw: Any) -> List[Dict[str, Any]]:
         if fid is None or lid is None:
             continue
 
-        for bm in item.get("bookmakers") or []:
-            bookmaker_name = str(bm.get("name") or "").strip()
+        # Isti za sve redove ovog fixture-a – računamo jednom, ne po vrednosti.
+        fixture_id = int(fid)
+        league_id = int(lid)
 
-            for bet in bm.get("bets") or []:
+        for bm in item.get("bookmakers") or ():
+            # Imena kladionica / marketa / labela se ponavljaju hiljadama puta –
+            # intern drži jednu kopiju stringa po vrednosti.
+            bookmaker_name = sys.intern(str(bm.get("name") or "").strip())
+
+            for bet in bm.get("bets") or ():
                 bet_name_raw = bet.get("name")
                 if bet_name_raw is None:
                     continue
+                bet_name = sys.intern(str(bet_name_raw))
 
-                for val in bet.get("values") or []:
+                for val in bet.get("values") or ():
                     label_raw = val.get("value")
-                    odd_str = val.get("odd")
                     try:
-                        odd_val = float(odd_str)
-                    except Exception:
+                        odd_val = float(val.get("odd"))
+                    except (TypeError, ValueError):
                         continue
 
-                    market_code = _map_market(bet_name_raw, label_raw)
-
-                    cleaned.append(
+                    append(
                         {
-                            "fixture_id": int(fid),
-                            "league_id": int(lid),
+                            "fixture_id": fixture_id,
+                            "league_id": league_id,
                             "bookmaker": bookmaker_name,
-                            "bet_name": str(bet_name_raw),
-                            "label": str(label_raw) if label_raw is not None else "",
-                            "market": market_code,
+                            "bet_name": bet_name,
+                            "label": sys.intern(str(label_raw)) if label_raw is not None else "",
+                            "market": _map_market(bet_name_raw, label_raw),
                             "odd": odd_val,
                         }
                     )
@@ -1,7 +1,11 @@
-import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+import orjson
 
 from .api_client import (
     fetch_fixtures_by_date,
@@ -11,7 +15,7 @@ from .api_client import (
     fetch_h2h,
     get_api_status,
 )
-from .cache import write_json, read_json, cache_status
+from .cache import write_json, read_json, has_data, cache_status
 from .cleaners import (
     clean_fixtures,
     clean_odds,
@@ -84,6 +88,13 @@ RISKY_LEAGUES: List[int] = [
     # primer: 751, 752
 ]
 
+# Set verzije za "in" provere u petljama po fixture-u (lista ostaje za redosled)
+DEFAULT_LEAGUES_SET: FrozenSet[int] = frozenset(DEFAULT_LEAGUES)
+RISKY_LEAGUES_SET: FrozenSet[int] = frozenset(RISKY_LEAGUES)
+
+# Broj paralelnih HTTP poziva u ingest-u (I/O-bound; QPS limiter iz api_client i dalje važi)
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "8"))
+
 
 # ---------------------------------------------------------------------
 # Helper funkcije
@@ -102,6 +113,68 @@ def get_dates_window(days_ahead: int = 2) -> List[date]:
     return [today + timedelta(days=i) for i in range(days_ahead + 1)]
 
 
+def _fetch_and_clean(fetch_fn: Callable[..., Any], clean_fn: Callable[[Any], Any], *args: Any) -> Any:
+    """
+    Fetch + clean u istom worker-u: sirovi API payload (za odds i do
+    desetine MB) se oslobađa čim se očisti, umesto da čeka ceo ingest.
+    """
+    return clean_fn(fetch_fn(*args))
+
+
+class FlatFx(NamedTuple):
+    """Ravan pogled na fixture – samo polja koja koriste team-stats i h2h petlje."""
+
+    fixture_id: Optional[int]
+    league_id: Optional[int]
+    home_id: Optional[int]
+    away_id: Optional[int]
+    date: Optional[str]
+
+
+def _flatten_fixtures(fixtures: List[Dict[str, Any]]) -> List[FlatFx]:
+    """
+    Jedan prolaz kroz fixture dict-ove; posle se petlje vrte nad FlatFx
+    umesto da svaka ponovo prolazi .get() lance.
+    """
+    out: List[FlatFx] = []
+    append = out.append
+    for fx in fixtures:
+        fixture = fx.get("fixture") or {}
+        league = fx.get("league") or {}
+        teams = fx.get("teams") or {}
+        append(
+            FlatFx(
+                fixture.get("id"),
+                league.get("id"),
+                (teams.get("home") or {}).get("id"),
+                (teams.get("away") or {}).get("id"),
+                fixture.get("date"),
+            )
+        )
+    return out
+
+
+def _fetch_and_clean_h2h(fixture_id: int, home_id: int, away_id: int) -> Any:
+    # fixture_id je deo ključa samo da bi se rezultat upario sa fajlom
+    return clean_h2h(fetch_h2h(home_id, away_id, 5))
+
+
+def _iter_parallel(fn: Callable[..., Any], args_list: List[tuple]) -> Iterator[Tuple[tuple, Any]]:
+    """
+    Pokreće fn(*args) za svaki element args_list u thread pool-u i vraća
+    (args, rezultat) parove redom kojim se završavaju – pozivalac može da
+    upisuje u cache čim stigne prvi odgovor, ne čeka najsporiji. Upis u
+    cache ostaje na pozivaocu (main thread).
+    """
+    if not args_list:
+        return
+    workers = max(1, min(INGEST_MAX_WORKERS, len(args_list)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(fn, *args): args for args in args_list}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
 # ---------------------------------------------------------------------
 # LAYER 1 – Data Automation: fetch_all_data
 # ---------------------------------------------------------------------
@@ -139,12 +212,21 @@ def fetch_all_data(days_ahead: int = 2) -> Dict[str, Any]:
     # 1) FIXTURES + ODDS za danas + naredna 2 dana
     fixtures_today: List[Dict[str, Any]] = []
 
-    for d in get_dates_window(days_ahead=days_ahead):
-        ds = _date_str(d)
+    days = get_dates_window(days_ahead=days_ahead)
+    day_strs = [_date_str(d) for d in days]
+
+    # Svi fixtures/odds pozivi za prozor idu paralelno; obrada ostaje po danu.
+    with ThreadPoolExecutor(max_workers=max(1, min(INGEST_MAX_WORKERS, 2 * len(days)))) as ex:
+        fixtures_futures = [
+            ex.submit(_fetch_and_clean, fetch_fixtures_by_date, clean_fixtures, ds) for ds in day_strs
+        ]
+        odds_futures = [
+            ex.submit(_fetch_and_clean, fetch_odds_by_date, clean_odds, ds) for ds in day_strs
+        ]
 
+    for d, ds, fixtures_future, odds_future in zip(days, day_strs, fixtures_futures, odds_futures):
         # 1.1 Fixtures
-        raw_fixtures = fetch_fixtures_by_date(ds)
-        fixtures = clean_fixtures(raw_fixtures)
+        fixtures = fixtures_future.result()
 
         if fixtures:
             # Imamo sveže podatke iz API-ja
@@ -181,8 +263,7 @@ def fetch_all_data(days_ahead: int = 2) -> Dict[str, Any]:
             fixtures_today = fixtures
 
         # 1.2 Odds
-        raw_odds = fetch_odds_by_date(ds)
-        odds = clean_odds(raw_odds)
+        odds = odds_future.result()
 
         if odds:
             write_json("odds.json", odds, day=d)
@@ -236,67 +317,72 @@ def fetch_all_data(days_ahead: int = 2) -> Dict[str, Any]:
 
         raw_standings = fetch_standings(league_id=league_id, season=season)
         standings = clean_standings(raw_standings)
-        write_json(f"standings/{league_id}.json", standings, day=today)
+        write_json(f"standings/{league_id}.json", standings, day=today, skip_unchanged=True)
         results_summary["standings"].append({"league": league_id, "teams": len(standings)})
         logger.info("[INGEST] Standings loaded for league=%s season=%s: teams=%s", league_id, season, len(standings))
 
+    flat_today = _flatten_fixtures(fixtures_today)
+
     # 3) TEAM STATS – za timove koji se pojavljuju u današnjim fixtures
     team_ids_by_league: Dict[int, set[int]] = {}
 
-    for fx in fixtures_today:
-        league = fx.get("league") or {}
-        lid = league.get("id")
-        if lid not in DEFAULT_LEAGUES:
+    for fx in flat_today:
+        lid = fx.league_id
+        if lid not in DEFAULT_LEAGUES_SET:
             continue
 
-        teams = fx.get("teams") or {}
-        home = teams.get("home") or {}
-        away = teams.get("away") or {}
-        home_id = home.get("id")
-        away_id = away.get("id")
-
-        if not home_id or not away_id:
+        if not fx.home_id or not fx.away_id:
             continue
 
-        team_ids_by_league.setdefault(lid, set()).update({home_id, away_id})
+        league_teams = team_ids_by_league.get(lid)
+        if league_teams is None:
+            league_teams = team_ids_by_league[lid] = set()
+        league_teams.add(fx.home_id)
+        league_teams.add(fx.away_id)
 
+    stats_keys: List[tuple] = []
+    stats_leagues: List[tuple] = []
     for league_id, team_ids in team_ids_by_league.items():
         season = SEASON_MAP.get(league_id)
         if not season:
             logger.warning("[INGEST] No SEASON_MAP entry for league_id=%s, skipping team stats", league_id)
             continue
 
-        for team_id in sorted(team_ids):
-            raw_stats = fetch_team_stats(league_id=league_id, season=season, team_id=team_id)
-            stats = clean_team_stats(raw_stats)
-            write_json(f"stats/{league_id}_{team_id}.json", stats, day=today)
-            results_summary["team_stats"].append(
-                {"league": league_id, "team_id": team_id}
-            )
+        # redosled nije bitan – svaki tim ide u svoj fajl
+        stats_keys.extend((league_id, season, team_id) for team_id in team_ids)
+        stats_leagues.append((league_id, season, len(team_ids)))
+
+    for (league_id, _season, team_id), stats in _iter_parallel(
+        partial(_fetch_and_clean, fetch_team_stats, clean_team_stats), stats_keys
+    ):
+        write_json(f"stats/{league_id}_{team_id}.json", stats, day=today, skip_unchanged=True)
+
+    # summary u stabilnom redosledu, nezavisno od redosleda završavanja
+    for league_id, _season, team_id in stats_keys:
+        results_summary["team_stats"].append(
+            {"league": league_id, "team_id": team_id}
+        )
+
+    for league_id, season, teams_count in stats_leagues:
         logger.info(
             "[INGEST] Team stats loaded for league=%s season=%s teams=%s",
             league_id,
             season,
-            len(team_ids),
+            teams_count,
         )
 
     # 4) H2H (last=5) za sve današnje mečeve
-    h2h_count = 0
-    for fx in fixtures_today:
-        fixture = fx.get("fixture") or {}
-        teams = fx.get("teams") or {}
-        home = teams.get("home") or {}
-        away = teams.get("away") or {}
-
-        fixture_id = fixture.get("id")
-        home_id = home.get("id")
-        away_id = away.get("id")
-
-        if not fixture_id or not home_id or not away_id:
+    h2h_keys: List[tuple] = []
+    for fx in flat_today:
+        if not fx.fixture_id or not fx.home_id or not fx.away_id:
             continue
 
-        raw_h2h = fetch_h2h(home_id=home_id, away_id=away_id, last=5)
-        h2h = clean_h2h(raw_h2h)
+        h2h_keys.append((fx.fixture_id, fx.home_id, fx.away_id))
+
+    h2h_count = 0
+    for (fixture_id, home_id, away_id), h2h in _iter_parallel(
+        _fetch_and_clean_h2h, h2h_keys
+    ):
         write_json(f"h2h/{fixture_id}.json", h2h, day=today)
         h2h_count += 1
 
@@ -373,11 +459,11 @@ def check_data_readiness(target_date: Optional[date] = None) -> Dict[str, Any]:
     stats["fixtures_count"] = len(fixtures or [])
     stats["odds_count"] = len(odds or [])
 
-    # Proveri da li postoji barem jedan standings fajl
+    # Proveri da li postoji barem jedan neprazan standings fajl (has_data:
+    # mali fajlovi se parsiraju, veći se računaju kao puni po veličini)
     has_standings = False
     for league_id in DEFAULT_LEAGUES:
-        st = read_json(f"standings/{league_id}.json", day=target_date)
-        if st:
+        if has_data(f"standings/{league_id}.json", day=target_date):
             has_standings = True
             break
 
@@ -400,7 +486,7 @@ def check_data_readiness(target_date: Optional[date] = None) -> Dict[str, Any]:
                 break
 
             league_id = league.get("id")
-            if league_id in RISKY_LEAGUES:
+            if league_id in RISKY_LEAGUES_SET:
                 risky_leagues_found.add(league_id)
 
             if not fixture.get("date"):
@@ -460,7 +546,7 @@ def run_morning_ingest_and_check() -> None:
         "summary": summary,
         "readiness": readiness,
     }
-    print(json.dumps(output, ensure_ascii=False, indent=2))
+    print(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8"))
 
 
 if __name__ == "__main__":
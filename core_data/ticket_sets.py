@@ -1,9 +1,10 @@
 # core_data/ticket_sets.py
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, FrozenSet, Iterable, Iterator, Optional, Tuple, Union
 from math import prod
+import heapq
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Leg:
     fixture_id: int
     league_id: int
@@ -13,17 +14,16 @@ class Leg:
     confidence: float  # 0.0–1.0 ili već normalizovano
     tags: Tuple[str, ...] = ()
 
-@dataclass
+@dataclass(slots=True)
 class Ticket:
     set_key: str
     ticket_key: str
     legs: List[Leg]
+    # računa se jednom pri konstrukciji; legs se posle ne menjaju
+    total_odds: float = field(init=False)
 
-    @property
-    def total_odds(self) -> float:
-        if not self.legs:
-            return 0.0
-        return prod(l.odds for l in self.legs)
+    def __post_init__(self) -> None:
+        self.total_odds = prod(l.odds for l in self.legs) if self.legs else 0.0
 
 
 # ---------------------------------------------------------------------------
@@ -115,36 +115,101 @@ SET_CONFIGS: List[Dict[str, Any]] = [
 ]
 
 
+@dataclass(frozen=True, slots=True)
+class TicketConfig:
+    ticket_key: str
+    families: FrozenSet[str]
+    legs_min: int
+    legs_max: int
+    max_per_family: int = 99
+
+
+@dataclass(frozen=True, slots=True)
+class SetConfig:
+    key: str
+    tickets: Tuple[TicketConfig, ...]
+
+
+def _compile_set(set_cfg: Dict[str, Any]) -> SetConfig:
+    """Dict config -> SetConfig (families kao frozenset, default-i popunjeni)."""
+    return SetConfig(
+        key=set_cfg["key"],
+        tickets=tuple(
+            TicketConfig(
+                ticket_key=t["ticket_key"],
+                families=frozenset(t["families"]),
+                legs_min=t["legs_min"],
+                legs_max=t["legs_max"],
+                max_per_family=t.get("max_per_family", 99),
+            )
+            for t in set_cfg["tickets"]
+        ),
+    )
+
+
+# SET_CONFIGS ostaje izvor koji se ručno edituje; builderi rade nad
+# kompajliranom verzijom (jednom pri importu).
+COMPILED_SETS: Tuple[SetConfig, ...] = tuple(_compile_set(c) for c in SET_CONFIGS)
+
+
 # ---------------------------------------------------------------------------
 # Helperi
 # ---------------------------------------------------------------------------
 
+def _rank_key(row: Tuple[int, Leg]) -> Tuple[float, int]:
+    # confidence desc; za iste confidence zadržava ulazni redosled
+    return (-row[1].confidence, row[0])
+
+
+class _FamilyIndex:
+    """
+    Kandidati koji prolaze globalne pragove (kvota / confidence), grupisani
+    po family i sortirani jednom po build_all_sets. Izbor za tiket je lazy
+    heapq.merge sortiranih listi – tiket koji stane posle par legova ne
+    plaća sortiranje celog pool-a.
+    """
+
+    def __init__(
+        self,
+        candidates: List[Leg],
+        min_conf: float = 0.62,
+        min_odds: float = 1.10,
+        max_odds: float = 1.40,
+    ) -> None:
+        by_family: Dict[str, List[Tuple[int, Leg]]] = {}
+        for idx, leg in enumerate(candidates):
+            if leg.odds < min_odds or leg.odds > max_odds:
+                continue
+            if leg.confidence < min_conf:
+                continue
+            by_family.setdefault(leg.family, []).append((idx, leg))
+        for rows in by_family.values():
+            rows.sort(key=_rank_key)
+        self._by_family = by_family
+
+    def select(self, families: Iterable[str]) -> Iterator[Leg]:
+        lists = [self._by_family[fam] for fam in frozenset(families) if fam in self._by_family]
+        if len(lists) == 1:
+            return (leg for _, leg in lists[0])
+        return (leg for _, leg in heapq.merge(*lists, key=_rank_key))
+
+
 def _filter_candidates(
     candidates: List[Leg],
-    families: List[str],
+    families: Iterable[str],
     min_conf: float = 0.62,
     min_odds: float = 1.10,
     max_odds: float = 1.40,
 ) -> List[Leg]:
-    out: List[Leg] = []
-    for leg in candidates:
-        if leg.family not in families:
-            continue
-        if leg.odds < min_odds or leg.odds > max_odds:
-            continue
-        if leg.confidence < min_conf:
-            continue
-        out.append(leg)
-    # sort by confidence desc
-    out.sort(key=lambda x: x.confidence, reverse=True)
-    return out
+    return list(_FamilyIndex(candidates, min_conf, min_odds, max_odds).select(families))
 
 
 def _build_single_ticket(
     set_key: str,
-    ticket_cfg: Dict[str, Any],
+    ticket_cfg: TicketConfig,
     pool: List[Leg],
     target_total_odds: float = 2.0,
+    index: Optional[_FamilyIndex] = None,
 ) -> Optional[Ticket]:
     """
     Pokušava da izgradi jedan tiket iz pool-a.
@@ -155,16 +220,20 @@ def _build_single_ticket(
       - 1 leg po fixture-u
       - ukupna kvota >= target_total_odds
     """
-    families = ticket_cfg["families"]
-    legs_min = ticket_cfg["legs_min"]
-    legs_max = ticket_cfg["legs_max"]
-    max_per_family = ticket_cfg.get("max_per_family", 99)
+    families = ticket_cfg.families
+    legs_min = ticket_cfg.legs_min
+    legs_max = ticket_cfg.legs_max
+    max_per_family = ticket_cfg.max_per_family
 
-    candidates = _filter_candidates(pool, families=families)
+    if index is None:
+        candidates = _filter_candidates(pool, families=families)
+    else:
+        candidates = index.select(families)
 
     legs: List[Leg] = []
     family_count: Dict[str, int] = {}
     used_fixtures: set[int] = set()
+    total_odds = 1.0
 
     for leg in candidates:
         if len(legs) >= legs_max:
@@ -180,9 +249,9 @@ def _build_single_ticket(
         legs.append(leg)
         used_fixtures.add(leg.fixture_id)
         family_count[leg.family] = fc + 1
+        total_odds *= leg.odds
 
         # ako smo došli do min broja legova i kvota je već 2+, možemo stati
-        total_odds = prod(l.odds for l in legs)
         if len(legs) >= legs_min and total_odds >= target_total_odds:
             break
 
@@ -191,7 +260,7 @@ def _build_single_ticket(
 
     ticket = Ticket(
         set_key=set_key,
-        ticket_key=ticket_cfg["ticket_key"],
+        ticket_key=ticket_cfg.ticket_key,
         legs=legs,
     )
     if ticket.total_odds < target_total_odds:
@@ -202,9 +271,10 @@ def _build_single_ticket(
 
 
 def build_ticket_set(
-    set_cfg: Dict[str, Any],
+    set_cfg: Union[SetConfig, Dict[str, Any]],
     candidates: List[Leg],
     target_total_odds: float = 2.0,
+    index: Optional[_FamilyIndex] = None,
 ) -> List[Ticket]:
     """
     Gradi do 3 tiketa za jedan set, sa fallback logikom:
@@ -213,11 +283,15 @@ def build_ticket_set(
     - ako <2 ali >=1 → vrati 1
     - ako 0 → [] (set se preskače)
     """
-    set_key = set_cfg["key"]
+    if isinstance(set_cfg, dict):
+        set_cfg = _compile_set(set_cfg)
+    set_key = set_cfg.key
     built: List[Ticket] = []
+    if index is None:
+        index = _FamilyIndex(candidates)
 
-    for ticket_cfg in set_cfg["tickets"]:
-        t = _build_single_ticket(set_key, ticket_cfg, candidates, target_total_odds)
+    for ticket_cfg in set_cfg.tickets:
+        t = _build_single_ticket(set_key, ticket_cfg, candidates, target_total_odds, index)
         if t:
             built.append(t)
 
@@ -245,10 +319,11 @@ def build_all_sets(
     - vraća dict: {set_key: [tickets...]}
     """
     result: Dict[str, List[Ticket]] = {}
+    index = _FamilyIndex(candidates)
 
-    for set_cfg in SET_CONFIGS:
-        tickets = build_ticket_set(set_cfg, candidates, target_total_odds)
+    for set_cfg in COMPILED_SETS:
+        tickets = build_ticket_set(set_cfg, candidates, target_total_odds, index)
         if tickets:
-            result[set_cfg["key"]] = tickets
+            result[set_cfg.key] = tickets
 
     return result
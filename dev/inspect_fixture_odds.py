@@ -10,9 +10,9 @@ def main():
         return
 
     fx_id = int(sys.argv[1])
-    today = date.today().isoformat()
+    today = date.today()
 
-    odds = read_json(today, "odds.json")
+    odds = read_json("odds.json", today) or []
     rows = [r for r in odds if r.get("fixture_id") == fx_id]
     print(f"[DEV] fixture_id={fx_id} rows={len(rows)}")
     for r in rows[:200]:
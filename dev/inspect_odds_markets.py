@@ -7,18 +7,15 @@ from datetime import date
 from core_data.cache import read_json, CACHE_ROOT
 
 def main():
-    today = date.today().isoformat()
-    print(f"[DEV] Inspect odds for {today}")
+    today = date.today()
+    print(f"[DEV] Inspect odds for {today.isoformat()}")
 
-    odds = read_json(today, "odds.json")
+    odds = read_json("odds.json", today) or []
     print(f"[DEV] odds rows: {len(odds)}")
 
-    c_market = Counter()
-    c_bet = Counter()
-
-    for row in odds:
-        c_market[row.get("market") or "NONE"] += 1
-        c_bet[(row.get("bet_name") or "").strip().lower()] += 1
+    # Counter(iterable) broji u C petlji umesto += 1 po redu
+    c_market = Counter(row.get("market") or "NONE" for row in odds)
+    c_bet = Counter((row.get("bet_name") or "").strip().lower() for row in odds)
 
     print("\n[DEV] Top markets by 'market' field:")
     for m, cnt in c_market.most_common(30):
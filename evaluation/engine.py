@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
+
+import orjson
 
 from core_data.api_client import fetch_fixtures_by_date
 from core_data.cleaners import clean_fixtures
@@ -21,8 +23,7 @@ def _load_tickets_for_date(target_date: date) -> Optional[Dict[str, Any]]:
     fp = PUBLIC_DIR / "tickets.json"
     if not fp.exists():
         return None
-    with fp.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = orjson.loads(fp.read_bytes())
     # date u fajlu je informativan – može da bude od juče dok radiš eval sutra
     return data
 
@@ -37,17 +38,39 @@ def _index_fixtures_by_id(fixtures: List[Dict[str, Any]]) -> Dict[int, Dict[str,
     return idx
 
 
+def _resolve_ht_o05(home: int, away: int, score: Dict[str, Any]) -> str:
+    ht = (score.get("halftime") or {})
+    ht_home = ht.get("home")
+    ht_away = ht.get("away")
+    if ht_home is None or ht_away is None:
+        return "⏳"
+    ht_total = (ht_home or 0) + (ht_away or 0)
+    return "✅" if ht_total >= 1 else "❌"
+
+
+# market -> resolver(home, away, score); jedan dict lookup umesto lanca if-ova
+_MARKET_RESOLVERS: Dict[str, Callable[[int, int, Dict[str, Any]], str]] = {
+    "O25": lambda home, away, _: "✅" if home + away >= 3 else "❌",
+    "U35": lambda home, away, _: "✅" if home + away <= 3 else "❌",
+    "HOME": lambda home, away, _: "✅" if home > away else "❌",
+    "BTTS": lambda home, away, _: "✅" if home > 0 and away > 0 else "❌",
+    "DC_1X": lambda home, away, _: "✅" if home >= away else "❌",
+    "DC_X2": lambda home, away, _: "✅" if away >= home else "❌",
+    "HT_O05": _resolve_ht_o05,
+}
+
+_FINISHED_STATUSES = frozenset({"FT", "AET", "PEN"})
+
+
 def _resolve_leg_result(leg: Dict[str, Any], fx: Dict[str, Any]) -> str:
     """
     Vraća: '✅', '❌' ili '⏳' (ako fixture nije završen / nema rezultata).
     """
     goals = fx.get("goals") or {}
-    score = fx.get("score") or {}
     status = (fx.get("fixture") or {}).get("status") or {}
-    status_short = status.get("short")
 
     # ako nije FT (završeno), tretiramo kao ⏳
-    if status_short not in ("FT", "AET", "PEN"):
+    if status.get("short") not in _FINISHED_STATUSES:
         return "⏳"
 
     home = goals.get("home")
@@ -55,32 +78,11 @@ def _resolve_leg_result(leg: Dict[str, Any], fx: Dict[str, Any]) -> str:
     if home is None or away is None:
         return "⏳"
 
-    total = (home or 0) + (away or 0)
-    market = leg.get("market")
-
-    if market == "O25":
-        return "✅" if total >= 3 else "❌"
-    if market == "U35":
-        return "✅" if total <= 3 else "❌"
-    if market == "HOME":
-        return "✅" if home > away else "❌"
-    if market == "BTTS":
-        return "✅" if home > 0 and away > 0 else "❌"
-    if market == "DC_1X":
-        return "✅" if home >= away else "❌"
-    if market == "DC_X2":
-        return "✅" if away >= home else "❌"
-    if market == "HT_O05":
-        ht = (score.get("halftime") or {})
-        ht_home = ht.get("home")
-        ht_away = ht.get("away")
-        if ht_home is None or ht_away is None:
-            return "⏳"
-        ht_total = (ht_home or 0) + (ht_away or 0)
-        return "✅" if ht_total >= 1 else "❌"
-
-    # default – ako ne znamo market
-    return "⏳"
+    resolver = _MARKET_RESOLVERS.get(leg.get("market"))
+    if resolver is None:
+        # default – ako ne znamo market
+        return "⏳"
+    return resolver(home, away, fx.get("score") or {})
 
 
 def _evaluate_ticket(
@@ -101,9 +103,7 @@ def _evaluate_ticket(
         else:
             result = _resolve_leg_result(leg, fx)
 
-        leg_copy = dict(leg)
-        leg_copy["result"] = result
-        evaluated_legs.append(leg_copy)
+        evaluated_legs.append({**leg, "result": result})
 
         if result == "⏳":
             any_pending = True
@@ -117,10 +117,7 @@ def _evaluate_ticket(
     else:
         ticket_result = "WIN"
 
-    out = dict(ticket)
-    out["legs"] = evaluated_legs
-    out["result"] = ticket_result
-    return out
+    return {**ticket, "legs": evaluated_legs, "result": ticket_result}
 
 
 def run_daily_evaluation(target_date: Optional[date] = None) -> Dict[str, Any]:
@@ -129,21 +126,16 @@ def run_daily_evaluation(target_date: Optional[date] = None) -> Dict[str, Any]:
 
     Tipično: target_date = jučerašnji datum.
     """
-    import json  # lokalni import da izbegnemo konflikte
-
     if target_date is None:
         target_date = date.today() - timedelta(days=1)
 
     target_str = target_date.isoformat()
 
     # 1) Učitaj tickets.json
-    fp = PUBLIC_DIR / "tickets.json"
-    if not fp.exists():
+    tickets_data = _load_tickets_for_date(target_date)
+    if tickets_data is None:
         raise FileNotFoundError("tickets.json not found in public/")
 
-    with fp.open("r", encoding="utf-8") as f:
-        tickets_data = json.load(f)
-
     # 2) Povuci fixtures za target_date sa API-FOOTBALL i očisti
     raw_fx = fetch_fixtures_by_date(target_str)
     fixtures = clean_fixtures(raw_fx)
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple
 
 from builders.builder_btts_yes import build_btts_yes_legs
 from core_data.aggregator import build_all_data  # noqa: F401  # rezervisano za buduće direktno korišćenje
 
 
-# Lige za BTTS Yes jutarnji feed
-BTTS_LEAGUES: List[int] = [
+# Lige za BTTS Yes jutarnji feed (frozenset – O(1) provera po fixture-u)
+BTTS_LEAGUES: FrozenSet[int] = frozenset({
     39,   # Premier League
     140,  # La Liga
     135,  # Serie A
@@ -30,11 +31,14 @@ BTTS_LEAGUES: List[int] = [
     136,
     736,
     207,
-]
+})
 
 BTTS_ODDS_MIN: float = 1.20
 BTTS_ODDS_MAX: float = 1.60
 
+# Deljeni prazan dict za `x.get(...) or _EMPTY` lance – samo se čita, nikad ne menja.
+_EMPTY: Dict[str, Any] = {}
+
 
 def _index_all_data(all_data: Dict[Any, Any]) -> Dict[int, Dict[str, Any]]:
     """
@@ -62,22 +66,37 @@ def _index_all_data(all_data: Dict[Any, Any]) -> Dict[int, Dict[str, Any]]:
 
 
 def _filter_fixtures_by_leagues(fixtures: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    for fx in fixtures:
-        league = fx.get("league") or {}
-        try:
-            league_id = int(league.get("id"))
-        except (TypeError, ValueError):
-            continue
-        if league_id in BTTS_LEAGUES:
-            out.append(fx)
-    return out
+    # league.id je int iz API-FOOTBALL payload-a; None/neispravan id prosto
+    # nije u setu, pa nema int() ni try/except po fixture-u
+    return [fx for fx in fixtures if (fx.get("league") or _EMPTY).get("id") in BTTS_LEAGUES]
+
+
+@lru_cache(maxsize=4096)
+def _parse_avg(raw: str) -> float:
+    """'1.4' / '1,4' -> 1.4; isti prosek se ponavlja kroz fixture-e istih timova."""
+    try:
+        return float(raw.replace(",", "."))
+    except ValueError:
+        return 0.0
+
+
+def _compute_avg_goals(goals_block: Dict[str, Any]) -> float:
+    if not isinstance(goals_block, dict):
+        return 0.0
+    for_root = goals_block.get("for") or goals_block.get("scored") or {}
+    avg = (for_root.get("average") or {}).get("total")
+    return _parse_avg(str(avg))
 
 
-def _build_match_card(leg: Dict[str, Any], all_block: Dict[str, Any]) -> Dict[str, Any]:
+def _build_card_and_stats(
+    leg: Dict[str, Any], all_block: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
-    Gradi jedan "card" entry za btts.json, iz standardizovanog lega + all_data bloka (ako postoji).
+    Gradi "card" entry za btts.json i bogati blok za btts.stats.json za jedan
+    fixture, iz standardizovanog lega + all_data bloka (ako postoji).
+    Oba dela dele isto raspakivanje fixture/league/teams bloka.
     """
+    all_block = all_block or _EMPTY
     fixture_id = leg.get("fixture_id")
     league_id = leg.get("league_id")
     league_name = leg.get("league_name")
@@ -87,9 +106,13 @@ def _build_match_card(leg: Dict[str, Any], all_block: Dict[str, Any]) -> Dict[st
     kickoff = leg.get("kickoff")
     odds = leg.get("odds")
 
-    fx = (all_block or {}).get("fixture") or {}
+    fx = all_block.get("fixture") or {}
     league = fx.get("league") or {}
     teams = fx.get("teams") or {}
+    home_team = teams.get("home") or {}
+    away_team = teams.get("away") or {}
+    odds_block = all_block.get("odds") or {}
+    h2h_last = all_block.get("h2h_last") or []
 
     # Override osnovnih polja ako su dostupna iz all_data
     if league.get("name"):
@@ -97,13 +120,8 @@ def _build_match_card(leg: Dict[str, Any], all_block: Dict[str, Any]) -> Dict[st
     if league.get("country"):
         league_country = league.get("country")
 
-    home_team = teams.get("home") or {}
-    away_team = teams.get("away") or {}
-
-    card_id = f"BTTS-{fixture_id}"
-
-    return {
-        "card_id": card_id,
+    card = {
+        "card_id": f"BTTS-{fixture_id}",
         "fixture_id": fixture_id,
         "league": {
             "id": league_id,
@@ -128,42 +146,20 @@ def _build_match_card(leg: Dict[str, Any], all_block: Dict[str, Any]) -> Dict[st
         "odds": odds,
     }
 
-
-def _build_stats_block(leg: Dict[str, Any], all_block: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Gradi bogati blok za btts.stats.json za jedan fixture.
-    """
-    fixture_id = leg.get("fixture_id")
-    fx = (all_block or {}).get("fixture") or {}
-    league = fx.get("league") or {}
-    teams = fx.get("teams") or {}
-    odds_block = (all_block or {}).get("odds") or {}
-    h2h_last = (all_block or {}).get("h2h_last") or []
-
     home_stats = {
-        "form": (all_block or {}).get("home_form"),
-        "goals": (all_block or {}).get("home_goals"),
-        "last5": (all_block or {}).get("home_last5"),
-        "standings": (all_block or {}).get("home_standings"),
+        "form": all_block.get("home_form"),
+        "goals": all_block.get("home_goals"),
+        "last5": all_block.get("home_last5"),
+        "standings": all_block.get("home_standings"),
     }
     away_stats = {
-        "form": (all_block or {}).get("away_form"),
-        "goals": (all_block or {}).get("away_goals"),
-        "last5": (all_block or {}).get("away_last5"),
-        "standings": (all_block or {}).get("away_standings"),
+        "form": all_block.get("away_form"),
+        "goals": all_block.get("away_goals"),
+        "last5": all_block.get("away_last5"),
+        "standings": all_block.get("away_standings"),
     }
 
     # Basic metrike iz goals bloka (ako postoje)
-    def _compute_avg_goals(goals_block: Dict[str, Any]) -> float:
-        if not isinstance(goals_block, dict):
-            return 0.0
-        for_root = goals_block.get("for") or goals_block.get("scored") or {}
-        avg = (for_root.get("average") or {}).get("total")
-        try:
-            return float(str(avg).replace(",", "."))
-        except Exception:
-            return 0.0
-
     home_avg_goals = _compute_avg_goals(home_stats.get("goals") or {})
     away_avg_goals = _compute_avg_goals(away_stats.get("goals") or {})
 
@@ -188,10 +184,7 @@ def _build_stats_block(leg: Dict[str, Any], all_block: Dict[str, Any]) -> Dict[s
     h2h_btts_rate = float(h2h_btts_count) / h2h_total if h2h_total else 0.0
     h2h_avg_goals = float(h2h_goals_sum) / h2h_total if h2h_total else 0.0
 
-    home_team = teams.get("home") or {}
-    away_team = teams.get("away") or {}
-
-    return {
+    stats = {
         "fixture": {
             "id": fx.get("id") or fixture_id,
             "date": fx.get("date") if isinstance(fx.get("date"), str) else None,
@@ -218,6 +211,7 @@ def _build_stats_block(leg: Dict[str, Any], all_block: Dict[str, Any]) -> Dict[s
             "avg_goals": h2h_avg_goals,
         },
     }
+    return card, stats
 
 
 def build_btts_feed(
@@ -306,27 +300,24 @@ def build_btts_feed(
 
     matches_cards: List[Dict[str, Any]] = []
     fixtures_stats: Dict[str, Dict[str, Any]] = {}
+    leagues_seen: set[int] = set()
 
     for leg in legs_sorted:
         fid = leg.get("fixture_id")
         if fid is None:
             continue
         fid_int = int(fid)
-        block = all_index.get(fid_int, {})
+        block = all_index.get(fid_int, _EMPTY)
 
-        card = _build_match_card(leg, block)
-        stats_block = _build_stats_block(leg, block)
+        card, stats_block = _build_card_and_stats(leg, block)
 
         matches_cards.append(card)
         fixtures_stats[str(fid_int)] = stats_block
+        league_id = card["league"]["id"]
+        if isinstance(league_id, int):
+            leagues_seen.add(league_id)
 
-    leagues_ids = sorted(
-        {
-            m["league"]["id"]
-            for m in matches_cards
-            if isinstance(m.get("league", {}).get("id"), int)
-        }
-    )
+    leagues_ids = sorted(leagues_seen)
 
     btts_feed = {
         "date": day.isoformat(),
@@ -1,13 +1,20 @@
 # outputs/pages_writer.py
 from __future__ import annotations
 
+from collections import Counter
 from pathlib import Path
 from datetime import date
-import json
 from typing import Dict, Any, List
 
+import orjson
+
 PUBLIC_DIR = Path(__file__).resolve().parent.parent / "public"
 
+# isti izlaz kao json.dump(ensure_ascii=False, indent=2) + završni newline;
+# NON_STR_KEYS jer json.dump tiho pretvara int ključeve u stringove.
+# Bajtovi idu pravo u write_bytes, bez text-io/utf-8 sloja.
+_ORJSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
 
 def _ensure_public_dir() -> None:
     PUBLIC_DIR.mkdir(parents=True, exist_ok=True)
@@ -24,20 +31,15 @@ def _summarize_ticket_sets(ticket_sets: Dict[str, Any]) -> Dict[str, Any]:
     if isinstance(raw_sets, list):
         sets = [s for s in raw_sets if isinstance(s, dict)]
 
-    tickets_total = 0
-    status_counts: Dict[str, int] = {}
-
-    for s in sets:
-        status = str(s.get("status") or "").upper() or "UNKNOWN"
-        status_counts[status] = status_counts.get(status, 0) + 1
-        tickets_total += len(s.get("tickets", []) or [])
+    status_counts = Counter(str(s.get("status") or "").upper() or "UNKNOWN" for s in sets)
+    tickets_total = sum(map(len, (s.get("tickets") or () for s in sets)))
 
     return {
         "date": ticket_sets.get("date") or date.today().isoformat(),
         "generated_at": ticket_sets.get("generated_at"),
         "sets_total": len(sets),
         "tickets_total": tickets_total,
-        "status_counts": status_counts,
+        "status_counts": dict(status_counts),
     }
 
 
@@ -61,8 +63,7 @@ def write_tickets_json(ticket_sets: Dict[str, Any]) -> None:
         "sets": ticket_sets.get("sets", []),
     }
     fp = PUBLIC_DIR / "tickets.json"
-    with fp.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    fp.write_bytes(orjson.dumps(data, option=_ORJSON_OPTS))
 
 
 def write_evaluation_json(evaluation: Dict[str, Any]) -> None:
@@ -78,8 +79,7 @@ def write_evaluation_json(evaluation: Dict[str, Any]) -> None:
     _ensure_public_dir()
 
     fp = PUBLIC_DIR / "evaluation.json"
-    with fp.open("w", encoding="utf-8") as f:
-        json.dump(evaluation, f, ensure_ascii=False, indent=2)
+    fp.write_bytes(orjson.dumps(evaluation, option=_ORJSON_OPTS))
 
 
 def write_btts_json(btts_feed: Dict[str, Any]) -> None:
@@ -95,8 +95,7 @@ def write_btts_json(btts_feed: Dict[str, Any]) -> None:
     """
     _ensure_public_dir()
     fp = PUBLIC_DIR / "btts.json"
-    with fp.open("w", encoding="utf-8") as f:
-        json.dump(btts_feed, f, ensure_ascii=False, indent=2)
+    fp.write_bytes(orjson.dumps(btts_feed, option=_ORJSON_OPTS))
 
 
 def write_btts_stats_json(btts_stats: Dict[str, Any]) -> None:
@@ -113,5 +112,4 @@ def write_btts_stats_json(btts_stats: Dict[str, Any]) -> None:
     """
     _ensure_public_dir()
     fp = PUBLIC_DIR / "btts.stats.json"
-    with fp.open("w", encoding="utf-8") as f:
-        json.dump(btts_stats, f, ensure_ascii=False, indent=2)
+    fp.write_bytes(orjson.dumps(btts_stats, option=_ORJSON_OPTS))
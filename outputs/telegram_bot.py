@@ -1,6 +1,8 @@
 # outputs/telegram_bot.py
+import atexit
 import os
 import logging
+import random
 import time
 from typing import Optional, Dict, Any
 
@@ -10,11 +12,34 @@ logger = logging.getLogger(__name__)
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 
+# Jedan klijent za sve poruke – keep-alive konekcija ka api.telegram.org,
+# TLS handshake jednom umesto po poruci/pokušaju. Thread-safe.
+# Najviše 10 istovremenih konekcija, do 5 ostaje otvoreno za ponovnu upotrebu.
+_client = httpx.Client(
+    timeout=15.0,
+    limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+)
+atexit.register(_client.close)
+
+# Retry: eksponencijalni backoff sa jitter-om; na 429 se poštuje retry_after
+_MAX_ATTEMPTS = 4
+_MAX_BACKOFF = 30.0
+
 def _bot_base_url() -> str:
     if not TELEGRAM_BOT_TOKEN:
         logger.warning("TELEGRAM_BOT_TOKEN nije setovan.")
     return f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
 
+def _retry_delay(attempt: int, resp: Optional[httpx.Response] = None) -> float:
+    if resp is not None:
+        try:
+            retry_after = (resp.json().get("parameters") or {}).get("retry_after")
+        except (ValueError, AttributeError):
+            retry_after = None
+        if retry_after:
+            return min(float(retry_after), _MAX_BACKOFF)
+    return min(_MAX_BACKOFF, 2 ** attempt) + random.uniform(0, 0.3)
+
 def send_message(chat_id: str, text: str, parse_mode: str = "Markdown") -> Optional[Dict[str, Any]]:
     url = f"{_bot_base_url()}/sendMessage"
     payload = {
@@ -25,21 +50,31 @@ def send_message(chat_id: str, text: str, parse_mode: str = "Markdown") -> Optio
     }
 
     last_error: Optional[Exception] = None
-    for attempt in range(2):
+    for attempt in range(_MAX_ATTEMPTS):
+        error_resp: Optional[httpx.Response] = None
         try:
-            with httpx.Client(timeout=15.0) as client:
-                resp = client.post(url, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-                if not data.get("ok"):
-                    logger.error(f"Telegram error: {data}")
-                return data
+            resp = _client.post(url, json=payload)
+            resp.raise_for_status()
+            data = resp.json()
+            if not data.get("ok"):
+                logger.error(f"Telegram error: {data}")
+            return data
+        except httpx.HTTPStatusError as e:
+            last_error = e
+            status = e.response.status_code
+            # 4xx (osim 429) je greška u zahtevu – ponavljanje ne pomaže
+            if status != 429 and status < 500:
+                logger.error("Telegram send rejected (%s): %s", status, e.response.text)
+                return None
+            error_resp = e.response
         except Exception as e:
             last_error = e
-            logger.warning(
-                "Telegram send attempt %s failed: %s", attempt + 1, e
-            )
-            time.sleep(2)
+
+        logger.warning(
+            "Telegram send attempt %s failed: %s", attempt + 1, last_error
+        )
+        if attempt + 1 < _MAX_ATTEMPTS:
+            time.sleep(_retry_delay(attempt, error_resp))
 
     if last_error:
         logger.error("Telegram send failed after retries: %s", last_error)